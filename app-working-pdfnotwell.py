@@ -1,220 +1,201 @@
 import streamlit as st
 import groq
-import tempfile
+import asyncio
 import os
-from fpdf import FPDF
-import textwrap
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
-import re
+from resume import get_client, get_resume_cache, parse_resume, render_pdf, stream_tokens
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Groq client
-client = groq.Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Groq Batch API statuses after which a batch makes no further progress
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
 
-def get_customized_resume(job_role, job_description, original_cv):
+# Name of this app's cache of generated resumes
+RESUME_CACHE = "resume-gen-cache"
+
+# Fixed instructions, sent as the system message so only the job and CV vary per request
+SYSTEM_PROMPT = """
+As an AI resume expert, your task is to customize the provided CV to better match the specified job role and description.
+
+Create a tailored resume that:
+1. Highlights relevant skills and experiences that match the job requirements
+2. Uses appropriate keywords from the job description
+3. Reorganizes content to emphasize the most relevant qualifications
+4. Maintains the candidate's genuine experience and skills (no fabrication)
+5. Has clear sections for Contact Information (use original), Professional Summary (tailored to the role),
+   Skills (prioritized based on job relevance), Work Experience (emphasizing relevant achievements) and Education
+
+Return ONLY a JSON object in this format:
+{"name": "Full Name",
+ "sections": [{"title": "Section title",
+               "kind": "contact|summary|skills|experience|education|projects|other",
+               "items": [...]}]}
+
+For contact, summary, skills and other sections, items are strings.
+For experience, education and projects sections, items are objects:
+{"title": "Job title, degree or project name", "subtitle": "Company or institution, location, duration", "bullets": ["..."]}
+"""
+
+def get_resume_prompt(job_role, job_description, original_cv):
+    """Get the user message with the job and CV to tailor"""
+    return f"Job Role: {job_role}\n\nJob Description: {job_description}\n\nOriginal CV: {original_cv}"
+
+def get_completion_request(job_role, job_description, original_cv, stream=False):
+    """Get the chat completion parameters shared by the on-demand, streaming and batch requests"""
+    request = {
+        "model": "llama3-8b-8192",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": get_resume_prompt(job_role, job_description, original_cv)},
+        ],
+        "temperature": 0.3,
+        # A tailored resume is about as long as the original; short CVs should not reserve 4000 tokens
+        "max_tokens": min(4000, max(800, len(original_cv) // 3 + 400)),
+    }
+    # Groq's JSON mode does not support streaming; the system prompt still asks for JSON
+    if stream:
+        request["stream"] = True
+        # Cut the stream off if the model starts appending commentary after the object
+        request["stop"] = ["\n\n---\n\n"]
+    else:
+        request["response_format"] = {"type": "json_object"}
+    return request
+
+def get_resume_cache_key(job_role, job_description, original_cv):
+    """Hash the full completion request, so prompt or model changes never return a stale resume"""
+    request = get_completion_request(job_role, job_description, original_cv)
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+def cache_resume(cache_key, content):
+    """Cache a generated resume for an hour, unless it did not parse into one (e.g. a truncated or off-schema reply)"""
+    if parse_resume(content).sections:
+        get_resume_cache(RESUME_CACHE).set(cache_key, content, expire=3600)
+
+async def get_customized_resume(aclient, job_role, job_description, original_cv):
     """Get a customized resume using the Llama model via Groq API"""
-    prompt = f"""
-    As an AI resume expert, your task is to customize the provided CV to better match the specified job role and description.
-    
-    Job Role: {job_role}
-    
-    Job Description: {job_description}
-    
-    Original CV: {original_cv}
-    
-    Create a tailored resume that:
-    1. Highlights relevant skills and experiences that match the job requirements
-    2. Uses appropriate keywords from the job description
-    3. Reorganizes content to emphasize the most relevant qualifications
-    4. Maintains the candidate's genuine experience and skills (no fabrication)
-    5. Has a professional format with clear sections for:
-       - Contact Information (use original)
-       - Professional Summary (tailored to the role)
-       - Skills (prioritized based on job relevance)
-       - Work Experience (emphasizing relevant achievements)
-       - Education
-    
-    Return only the customized resume content in a clean format, ready to be converted to PDF.
-    Format the output in a consistent way that can be parsed by section headers.
-    """
+    cache_key = get_resume_cache_key(job_role, job_description, original_cv)
+    cached_content = get_resume_cache(RESUME_CACHE).get(cache_key)
+    if cached_content is not None:
+        return cached_content
     
     try:
-        response = client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=4000,
+        response = await aclient.chat.completions.create(
+            **get_completion_request(job_role, job_description, original_cv)
         )
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        cache_resume(cache_key, content)
+        return content
     except Exception as e:
         return f"Error generating customized resume: {str(e)}"
 
-def create_professional_pdf(content, output_path):
-    """Create a professionally formatted PDF resume"""
-    # Create PDF instance
-    class PDF(FPDF):
-        def header(self):
-            # No header
-            pass
-        
-        def footer(self):
-            # Footer with page number
-            self.set_y(-15)
-            self.set_font('Arial', 'I', 8)
-            self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-    
-    pdf = PDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    
-    # Extract name from content (assuming it's the first line)
-    lines = content.split('\n')
-    name = lines[0].strip('*')
-    
-    # Name at the top
-    pdf.set_font('Arial', 'B', 16)
-    pdf.cell(0, 10, name, 0, 1, 'C')
-    pdf.ln(2)
-    
-    # Parse sections from content
-    sections = {}
-    current_section = None
-    current_content = []
+async def get_customized_resumes_batch(api_key, jobs):
+    """Customize resumes for several (job_role, job_description, original_cv) jobs concurrently"""
+    # The async client is bound to the running event loop, so create it per batch
+    async with groq.AsyncGroq(api_key=api_key) as aclient:
+        results = await asyncio.gather(
+            *(get_customized_resume(aclient, job_role, job_description, original_cv)
+              for job_role, job_description, original_cv in jobs),
+            return_exceptions=True,
+        )
     
-    # Regular expression to match section headers
-    section_pattern = re.compile(r'\*\*(.*?):\*\*')
+    # One failed job should not discard the others
+    return [
+        f"Error generating customized resume: {str(result)}" if isinstance(result, Exception) else result
+        for result in results
+    ]
+
+def get_customized_resumes_bulk(client, jobs, deadline, poll_interval=5):
+    """Customize resumes through the Groq Batch API, falling back to on-demand calls for jobs not done by the deadline (seconds)"""
+    cache_keys = [get_resume_cache_key(*job) for job in jobs]
+    resume_cache = get_resume_cache(RESUME_CACHE)
+    results = [resume_cache.get(cache_key) for cache_key in cache_keys]
     
-    for line in lines[1:]:  # Skip the name line
-        # Check if this is a section header
-        match = section_pattern.match(line)
-        if match:
-            # If we already have a section, save it
-            if current_section:
-                sections[current_section] = current_content
-            
-            # Start a new section
-            current_section = match.group(1)
-            current_content = []
-        elif current_section:
-            current_content.append(line.strip())
+    # Only submit the jobs that are not cached yet
+    batch_input = "\n".join(
+        json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": get_completion_request(job_role, job_description, original_cv),
+        })
+        for i, (job_role, job_description, original_cv) in enumerate(jobs)
+        if results[i] is None
+    )
     
-    # Add the last section
-    if current_section and current_content:
-        sections[current_section] = current_content
+    if not batch_input:
+        return results
     
-    # Process each section
-    for section, content in sections.items():
-        # Section header
-        pdf.set_font('Arial', 'B', 12)
-        pdf.set_fill_color(240, 240, 240)  # Light gray background
-        pdf.cell(0, 8, section, 1, 1, 'L', True)
-        pdf.ln(1)
-        
-        # Section content
-        pdf.set_font('Arial', '', 10)
-        
-        # Special formatting for different sections
-        if section == "Contact Information":
-            # Format contact info in a single line or multiple lines
-            contact_text = ' | '.join([c for c in content if c])
-            
-            # Wrap long contact information
-            wrapped_lines = textwrap.wrap(contact_text, width=100)
-            for wrapped_line in wrapped_lines:
-                pdf.cell(0, 6, wrapped_line, 0, 1)
+    try:
+        batch_file = client.files.create(file=("resumes.jsonl", batch_input.encode("utf-8")), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
         
-        elif section == "Skills":
-            # Format skills as bullet points
-            for skill_line in content:
-                if skill_line.startswith('*'):
-                    skill_text = skill_line[1:].strip()
-                    pdf.cell(5, 6, chr(149), 0, 0)  # Bullet point
-                    pdf.cell(0, 6, skill_text, 0, 1)
-                elif skill_line:
-                    pdf.cell(0, 6, skill_line, 0, 1)
+        # Poll until the batch finishes or the deadline passes
+        deadline_at = time.monotonic() + deadline
+        while batch.status not in BATCH_FINAL_STATUSES and time.monotonic() < deadline_at:
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
         
-        elif section == "Work Experience" or section == "Education":
-            # Format work experience with better indentation
-            current_role = None
-            
-            for line in content:
-                if line.startswith('*'):
-                    # This is a job title or degree
-                    current_role = line.strip('* ')
-                    parts = current_role.split(',', 1)
-                    
-                    if len(parts) >= 2:
-                        role, company_info = parts
-                        pdf.set_font('Arial', 'B', 10)
-                        pdf.cell(0, 6, role, 0, 1)
-                        pdf.set_font('Arial', 'I', 10)
-                        pdf.cell(0, 6, company_info, 0, 1)
-                    else:
-                        pdf.set_font('Arial', 'B', 10)
-                        pdf.cell(0, 6, current_role, 0, 1)
-                    
-                    pdf.set_font('Arial', '', 10)
-                
-                elif line.startswith('+'):
-                    # This is a bullet point under a role
-                    bullet_text = line[1:].strip()
-                    pdf.cell(10, 6, '', 0, 0)  # Indentation
-                    pdf.cell(3, 6, chr(149), 0, 0)  # Bullet point
-                    
-                    # Wrap text for bullet points with proper indentation
-                    wrapped_lines = textwrap.wrap(bullet_text, width=85)
-                    if wrapped_lines:
-                        pdf.cell(0, 6, wrapped_lines[0], 0, 1)
-                        for wrapped_line in wrapped_lines[1:]:
-                            pdf.cell(13, 6, '', 0, 0)  # Indentation
-                            pdf.cell(0, 6, wrapped_line, 0, 1)
-                
-                elif line:
-                    pdf.cell(0, 6, line, 0, 1)
+        if batch.status not in BATCH_FINAL_STATUSES:
+            batch = client.batches.cancel(batch.id)
         
-        elif section == "Personal Projects":
-            # Format projects similar to work experience
-            current_project = None
-            
-            for line in content:
-                if line.startswith('*'):
-                    # This is a project title
-                    current_project = line.strip('* ')
-                    pdf.set_font('Arial', 'B', 10)
-                    pdf.cell(0, 6, current_project, 0, 1)
-                    pdf.set_font('Arial', '', 10)
-                
-                elif line.startswith('+'):
-                    # This is a bullet point under a project
-                    bullet_text = line[1:].strip()
-                    pdf.cell(10, 6, '', 0, 0)  # Indentation
-                    pdf.cell(3, 6, chr(149), 0, 0)  # Bullet point
-                    
-                    # Wrap text for bullet points
-                    wrapped_lines = textwrap.wrap(bullet_text, width=85)
-                    if wrapped_lines:
-                        pdf.cell(0, 6, wrapped_lines[0], 0, 1)
-                        for wrapped_line in wrapped_lines[1:]:
-                            pdf.cell(13, 6, '', 0, 0)  # Indentation
-                            pdf.cell(0, 6, wrapped_line, 0, 1)
-                
-                elif line:
-                    pdf.cell(0, 6, line, 0, 1)
-        
-        else:
-            # Default formatting for other sections
-            for line in content:
-                if line:
-                    wrapped_lines = textwrap.wrap(line, width=100)
-                    for wrapped_line in wrapped_lines:
-                        pdf.cell(0, 6, wrapped_line, 0, 1)
-        
-        pdf.ln(5)  # Add space between sections
+        # Collect whatever finished; a partially processed batch can still have an output file
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text().splitlines():
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") == 200:
+                    i = int(result["custom_id"])
+                    results[i] = response["body"]["choices"][0]["message"]["content"]
+                    cache_resume(cache_keys[i], results[i])
+    except Exception as e:
+        st.warning(f"Batch API unavailable, generating resumes directly: {str(e)}")
     
-    # Save the PDF
-    pdf.output(output_path)
+    # Dispatch the remaining jobs through the concurrent on-demand path
+    remaining = [i for i, result in enumerate(results) if result is None]
+    if remaining:
+        fallback_results = asyncio.run(get_customized_resumes_batch(client.api_key, [jobs[i] for i in remaining]))
+        for i, result in zip(remaining, fallback_results):
+            results[i] = result
+    
+    return results
+
+def render_resume(content):
+    """Render the PDF of a generated resume, or None if the content did not parse into one (e.g. an API error)"""
+    resume = parse_resume(content)
+    return render_pdf(resume) if resume.sections else None
+
+@st.cache_resource
+def get_pdf_pool():
+    """Get the worker processes for PDF rendering, shared across reruns and sessions"""
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+def stream_customized_resume(client, job_role, job_description, original_cv, preview):
+    """Stream a customized resume from the Groq API into the preview as tokens arrive.
+    Returns the resume content and the PDF bytes."""
+    cache_key = get_resume_cache_key(job_role, job_description, original_cv)
+    cached_content = get_resume_cache(RESUME_CACHE).get(cache_key)
+    if cached_content is not None:
+        return cached_content, render_resume(cached_content)
+    
+    try:
+        response = client.chat.completions.create(
+            **get_completion_request(job_role, job_description, original_cv, stream=True)
+        )
+        content = stream_tokens(response, preview)
+        cache_resume(cache_key, content)
+    except Exception as e:
+        content = f"Error generating customized resume: {str(e)}"
+    
+    return content, render_resume(content)
 
 def main():
     st.set_page_config(page_title="AI Resume Customizer", layout="wide")
@@ -224,20 +205,37 @@ def main():
     
     # # API key input
     api_key = st.text_input("Enter your Groq API Key:", type="password")
-    if api_key:
-        os.environ["GROQ_API_KEY"] = api_key
+    client = get_client(api_key) if api_key else None
     
     # Create two columns for inputs
     col1, col2 = st.columns(2)
     
     with col1:
-        job_role = st.text_input("Job Role:", placeholder="Software Engineer")
+        jobs_count = st.number_input("Number of job postings:", min_value=1, max_value=10, value=1)
         
-        job_description = st.text_area(
-            "Job Description:", 
-            height=300,
-            placeholder="Paste the complete job description here..."
-        )
+        job_postings = []
+        for i in range(jobs_count):
+            suffix = f" #{i+1}" if jobs_count > 1 else ""
+            job_role = st.text_input(f"Job Role{suffix}:", placeholder="Software Engineer", key=f"job_role_{i}")
+            
+            job_description = st.text_area(
+                f"Job Description{suffix}:", 
+                height=300,
+                placeholder="Paste the complete job description here...",
+                key=f"job_description_{i}"
+            )
+            job_postings.append((job_role, job_description))
+        
+        # Bulk mode only pays off for several job postings
+        bulk_mode = False
+        if jobs_count > 1:
+            bulk_mode = st.checkbox(
+                "Bulk mode",
+                value=False,
+                help="Use the Groq Batch API (lower cost) and generate directly whatever is not done by the deadline"
+            )
+            if bulk_mode:
+                bulk_deadline = st.number_input("Bulk mode deadline (minutes):", min_value=1, max_value=24 * 60, value=10)
     
     with col2:
         original_cv = st.text_area(
@@ -246,39 +244,75 @@ def main():
             placeholder="Paste your current resume/CV content here..."
         )
     
+    # Identifies the inputs of a run, so clicking Generate again without changes reuses its results
+    inputs_key = hash((tuple(job_postings), original_cv))
+    
     # Process button
     if st.button("Generate Customized Resume"):
         if not api_key:
             st.error("Please enter your Groq API key")
-        elif not job_role or not job_description or not original_cv:
+        elif not original_cv or not all(job_role and job_description for job_role, job_description in job_postings):
             st.error("Please fill in all fields")
+        elif st.session_state.get("last_key") == inputs_key:
+            # Same inputs as the last run, whose results are shown below
+            pass
+        elif len(job_postings) == 1:
+            job_role, job_description = job_postings[0]
+            
+            # Stream the customized content into the status while it is generated
+            with st.status(f"Customizing your resume for {job_role}...", expanded=True) as status:
+                preview = st.empty()
+                customized_content, pdf_bytes = stream_customized_resume(client, job_role, job_description, original_cv, preview)
+                preview.empty()
+                status.update(label="Your customized resume is ready", state="complete", expanded=False)
+            
+            st.session_state["last_results"] = [(job_role, customized_content, pdf_bytes)]
+            # A failed run (e.g. rate limited) is not remembered, so clicking Generate again retries it
+            st.session_state["last_key"] = inputs_key if pdf_bytes else None
         else:
-            with st.spinner("Customizing your resume... This may take a minute"):
-                # Get customized resume content
-                customized_content = get_customized_resume(job_role, job_description, original_cv)
-                
-                # Create temporary file for PDF
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    tmp_path = tmp_file.name
-                
-                # Create PDF
-                create_professional_pdf(customized_content, tmp_path)
+            with st.status("Customizing your resume... This may take a minute", expanded=True) as status:
+                # Get customized resume content for all job postings at once
+                jobs = [(job_role, job_description, original_cv) for job_role, job_description in job_postings]
+                if bulk_mode:
+                    customized_contents = get_customized_resumes_bulk(client, jobs, bulk_deadline * 60)
+                else:
+                    customized_contents = asyncio.run(get_customized_resumes_batch(api_key, jobs))
                 
-                # Display customized content
-                st.subheader("Customized Resume Preview:")
-                st.text_area("Preview:", value=customized_content, height=400)
-                
-                # Provide download button for PDF
-                with open(tmp_path, "rb") as pdf_file:
-                    st.download_button(
-                        label="Download Resume as PDF",
-                        data=pdf_file,
-                        file_name=f"Customized_Resume_{job_role.replace(' ', '_')}.pdf",
-                        mime="application/pdf"
-                    )
-                
-                # Clean up the temporary file
-                os.unlink(tmp_path)
+                # Render all PDFs in parallel; rendering is CPU-bound and would otherwise hold the GIL
+                status.update(label="Rendering PDFs...")
+                pdf_pool = get_pdf_pool()
+                resumes = [parse_resume(customized_content) for customized_content in customized_contents]
+                pdf_jobs = [pdf_pool.submit(render_pdf, resume) if resume.sections else None for resume in resumes]
+                pdfs = [pdf_job.result() if pdf_job else None for pdf_job in pdf_jobs]
+                status.update(label="Your customized resumes are ready", state="complete", expanded=False)
+            
+            st.session_state["last_results"] = [
+                (job_role, customized_content, pdf_bytes)
+                for (job_role, _), customized_content, pdf_bytes in zip(job_postings, customized_contents, pdfs)
+            ]
+            st.session_state["last_key"] = inputs_key if all(pdfs) else None
+    
+    # Show the last results from the session, so reruns (e.g. after a download) keep them without calling the API again
+    for i, (job_role, customized_content, pdf_bytes) in enumerate(st.session_state.get("last_results", [])):
+        st.subheader(f"Customized Resume ({job_role}):")
+        
+        # Collapsed by default so users who only want the PDF don't pay for rendering the content
+        with st.expander("Preview"):
+            st.code(customized_content, language="json")
+        
+        # Nothing could be recovered from the response (e.g. an API error), so there is no PDF to offer
+        if pdf_bytes is None:
+            st.error("The AI response could not be turned into a resume. The raw response is in the preview above; please try again.")
+            continue
+        
+        # Provide download button for PDF
+        st.download_button(
+            label="Download Resume as PDF",
+            data=pdf_bytes,
+            file_name=f"Customized_Resume_{job_role.replace(' ', '_')}.pdf",
+            mime="application/pdf",
+            key=f"download_{i}"
+        )
 
 if __name__ == "__main__":
     main()
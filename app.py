@@ -1,29 +1,79 @@
 import streamlit as st
-import groq
-import tempfile
 import os
-import json
-from fpdf import FPDF  # Keep original import, but install fpdf version 2+
-import textwrap
+import hashlib
+import functools
+import orjson
+import json_repair
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from io import StringIO
-from pdfminer.high_level import extract_text as extract_pdf_text
-import docx2txt
+from io import BytesIO
+import zipfile
+import xml.etree.ElementTree as ET
+from resume import Entry, Resume, Section, extract_pdf_text, get_client, get_resume_cache, render_pdf, stream_tokens
 
-def extract_text_from_file(uploaded_file):
-    file_type = uploaded_file.name.split('.')[-1].lower()
+# Resumes are short, so later pages (usually attachments or scans) are skipped
+MAX_CV_PAGES = 5
+EXTRACTION_TIMEOUT = 30  # seconds
+# A resume is well under this; bigger files are mostly images and only slow extraction down
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+
+# WordprocessingML namespace of the text (w:t), tab (w:tab), line break (w:br) and paragraph (w:p) elements
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def extract_docx_text(docx_bytes):
+    """Extract the text of a DOCX straight from its XML parts: headers, then the body, then footers"""
+    lines = []
+    with zipfile.ZipFile(BytesIO(docx_bytes)) as docx:
+        names = docx.namelist()
+        parts = (
+            [name for name in names if name.startswith("word/header") and name.endswith(".xml")]
+            + ["word/document.xml"]
+            + [name for name in names if name.startswith("word/footer") and name.endswith(".xml")]
+        )
+        for part in parts:
+            with docx.open(part) as xml_file:
+                runs = []
+                for _, element in ET.iterparse(xml_file):
+                    if element.tag == W + "t":
+                        runs.append(element.text or "")
+                    elif element.tag == W + "tab":
+                        runs.append("\t")
+                    elif element.tag == W + "br":
+                        runs.append("\n")
+                    elif element.tag == W + "p":
+                        # Runs split words arbitrarily, so they are joined without a separator
+                        lines.append("".join(runs))
+                        runs = []
+                        element.clear()
+    return "\n".join(lines)
 
+# Re-uploading the same file (or the rerun after any widget change) reuses the earlier text
+@st.cache_data(max_entries=16, show_spinner=False)
+def extract_cv_text(file_bytes, file_type):
+    """Extract the text of an uploaded PDF, DOCX or TXT CV from its bytes"""
     if file_type == 'pdf':
-        text = extract_pdf_text(uploaded_file)
-    elif file_type in ['docx', 'doc']:
-        text = docx2txt.process(uploaded_file)
-    elif file_type == 'txt':
-        stringio = StringIO(uploaded_file.getvalue().decode("utf-8"))
-        text = stringio.read()
-    else:
+        # A pathological PDF is stopped instead of hanging the app; a timeout raises, so it is not cached
+        return extract_pdf_text(file_bytes, MAX_CV_PAGES, EXTRACTION_TIMEOUT)
+    elif file_type == 'docx':
+        return extract_docx_text(file_bytes)
+    return file_bytes.decode("utf-8")
+
+def extract_text_from_file(uploaded_file):
+    file_type = uploaded_file.name.split('.')[-1].lower()
+    
+    if file_type not in ['pdf', 'docx', 'txt']:
         st.error('Unsupported file type. Please upload a PDF, DOCX, or TXT file.')
         return None
-    return text
+    
+    if uploaded_file.size > MAX_UPLOAD_BYTES:
+        st.error(f'This file is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB. Please upload a smaller file or paste the text instead.')
+        return None
+    
+    try:
+        return extract_cv_text(uploaded_file.getvalue(), file_type)
+    except TimeoutError:
+        st.error('Extracting text from this PDF took too long. Please upload a simpler file or paste the text instead.')
+        return None
 
 
 # Load environment variables
@@ -32,14 +82,56 @@ load_dotenv()
 # Get API key from environment variables
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-# Initialize Groq client
-client = groq.Groq(api_key=GROQ_API_KEY)
+# Name of this app's cache of generated resume JSON
+RESUME_CACHE = "resume-gen-json-cache"
 
-def get_default_prompt(job_role, job_description, original_cv):
-    """Get the default prompt template with fields filled in"""
-    return f"""
-    As an AI resume expert, your task is to customize the provided CV to better match the specified job role and description.
-    
+# Fixed instructions and JSON schema, sent as the system message so only the editable prompt varies per request
+SYSTEM_PROMPT = """
+As an AI resume expert, your task is to customize the provided CV to better match the specified job role and description.
+
+Return the resume in the following JSON format:
+{
+    "name": "Full Name",
+    "contact_info": {
+        "location": "City, Country",
+        "phone": "Phone number",
+        "email": "Email address",
+        "linkedin": "LinkedIn URL",
+        "github": "GitHub URL",
+        "portfolio": "Any other relevant URL",
+        "additional": "Any other contact information"
+    },
+    "professional_summary": "A tailored summary for the role...",
+    "skills": ["Skill 1", "Skill 2"],
+    "work_experience": [
+        {"title": "Job Title", "company": "Company Name", "location": "City, Country",
+         "duration": "MM/YYYY to MM/YYYY", "achievements": ["Achievement 1", "Achievement 2"]}
+    ],
+    "education": [
+        {"degree": "Degree Name", "institution": "Institution Name", "location": "City, Country",
+         "duration": "MM/YYYY to MM/YYYY", "details": ["Detail 1", "Detail 2"]}
+    ],
+    "projects": [
+        {"name": "Project Name", "details": ["Detail 1", "Detail 2"]}
+    ]
+}
+
+Return ONLY the JSON object without any other text, explanation, or formatting.
+"""
+
+# Context window of each model, and the part of it kept free for the resume and the fixed instructions
+CONTEXT_WINDOWS = {"llama3-8b-8192": 8192, "llama3-70b-8192": 8192, "mixtral-8x7b-32768": 32768}
+MAX_TOKENS = 4000
+PROMPT_OVERHEAD_TOKENS = 600
+# Conservative estimate, so a CV within its budget never overflows the context window
+CHARS_PER_TOKEN = 3
+# Two pages of useful resume text; longer CVs only add input tokens, cost and latency
+MAX_CV_CHARS = 8000
+# About a page; a longer job description is shortened rather than leaving the CV less room than this
+MIN_CV_CHARS = 4000
+
+# Editable part of the prompt, filled in per request by get_default_prompt
+PROMPT_TEMPLATE = """
     Job Role: {job_role}
     
     Job Description: {job_description}
@@ -52,371 +144,227 @@ def get_default_prompt(job_role, job_description, original_cv):
     3. Reorganizes content to emphasize the most relevant qualifications
     4. Maintains the candidate's genuine experience and skills (no fabrication)
     5. Remove any special characters (like –) in the CV and use the common ones.
-    
-    Return the resume in the following JSON format:
-    {{
-        "name": "Full Name",
-        "contact_info": {{
-            "location": "City, Country",
-            "phone": "Phone number",
-            "email": "Email address",
-            "linkedin": "LinkedIn URL",
-            "github": "GitHub URL",
-            "portfolio": "Any other relevant URL",
-            "additional": "Any other contact information"
-        }},
-        "professional_summary": "A tailored summary for the role...",
-        "skills": [
-            "Skill 1",
-            "Skill 2",
-            "etc..."
-        ],
-        "work_experience": [
-            {{
-                "title": "Job Title",
-                "company": "Company Name",
-                "location": "City, Country",
-                "duration": "MM/YYYY to MM/YYYY",
-                "achievements": [
-                    "Achievement 1",
-                    "Achievement 2"
-                ]
-            }}
-        ],
-        "education": [
-            {{
-                "degree": "Degree Name",
-                "institution": "Institution Name",
-                "location": "City, Country",
-                "duration": "MM/YYYY to MM/YYYY",
-                "details": [
-                    "Detail 1",
-                    "Detail 2"
-                ]
-            }}
-        ],
-        "projects": [
-            {{
-                "name": "Project Name",
-                "details": [
-                    "Detail 1",
-                    "Detail 2"
-                ]
-            }}
-        ]
-    }}
-    
-    Return ONLY the JSON object without any other text, explanation, or formatting.
     """
 
-def get_customized_resume_json(prompt, model="llama3-8b-8192"):
-    """Get a customized resume in JSON format using the specified model via Groq API"""
+# Reruns with unchanged inputs (e.g. while the prompt editor is open) reuse the filled-in prompt
+@functools.lru_cache(maxsize=8)
+def get_default_prompt(job_role, job_description, original_cv):
+    """Get the default prompt template with fields filled in"""
+    return PROMPT_TEMPLATE.format_map({"job_role": job_role, "job_description": job_description, "original_cv": original_cv})
+
+def truncate_inputs(original_cv, job_role, job_description, model):
+    """Shorten the CV to MAX_CV_CHARS, then the CV (down to MIN_CV_CHARS) and then the job description so the prompt
+    fits the model's context window; returns the CV, the job description and whether each was shortened"""
+    prompt_chars = (CONTEXT_WINDOWS.get(model, 8192) - MAX_TOKENS - PROMPT_OVERHEAD_TOKENS) * CHARS_PER_TOKEN
+    cv_chars = min(len(original_cv), MAX_CV_CHARS, max(MIN_CV_CHARS, prompt_chars - len(job_role) - len(job_description)))
+    description_chars = max(0, prompt_chars - len(job_role) - cv_chars)
+    return (
+        original_cv[:cv_chars],
+        job_description[:description_chars],
+        cv_chars < len(original_cv),
+        description_chars < len(job_description),
+    )
+
+def get_customized_resume_json(client, resume_cache, prompt, model="llama3-8b-8192", preview=None, variant=0):
+    """Get a customized resume in JSON format using the specified model via Groq API.
+    Tokens are streamed into the preview placeholder, if given, as they arrive."""
+    # Identical prompts reuse the earlier response instead of calling the API again; each variant is cached on its own
+    cache_key = hashlib.sha256(f"{model}\n{variant}\n{SYSTEM_PROMPT}\n{prompt}".encode("utf-8")).hexdigest()
+    content = resume_cache.get(cache_key)
+    
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=4000,
-        )
-        content = response.choices[0].message.content
-        
+        if content is None:
+            request = dict(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+                max_tokens=MAX_TOKENS,
+            )
+            
+            # Groq's JSON mode does not support streaming, so it is only used without a preview
+            if preview is None:
+                response = client.chat.completions.create(**request, response_format={"type": "json_object"})
+                content = response.choices[0].message.content
+            else:
+                content = stream_tokens(client.chat.completions.create(**request, stream=True), preview)
+            
         # Try to parse the JSON
         try:
-            # Clean up the content to handle potential extra characters or formatting
-            json_content = content
-            # If content starts with ```json and ends with ```, strip those
-            if content.strip().startswith("```json") and content.strip().endswith("```"):
-                json_content = content.strip()[7:-3].strip()
-            elif content.strip().startswith("```") and content.strip().endswith("```"):
-                json_content = content.strip()[3:-3].strip()
-                
-            resume_data = json.loads(json_content)
+            # A streamed response may still come wrapped in code fences or prose, so parse only the object
+            start, end = content.find('{'), content.rfind('}')
+            resume_data = orjson.loads(content[start:end + 1])
+            resume_cache.set(cache_key, content, expire=3600)
             return {"success": True, "data": resume_data, "raw": content}
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
+            # The response was likely cut off at max_tokens; close the open strings and brackets to salvage it
+            resume_data = json_repair.loads(content[start:]) if start != -1 else None
+            if isinstance(resume_data, dict) and resume_data:
+                return {"success": True, "data": resume_data, "raw": content, "repaired": True}
             return {"success": False, "error": f"JSON parsing error: {str(e)}", "raw": content}
             
     except Exception as e:
         return {"success": False, "error": f"API error: {str(e)}", "raw": ""}
 
+# Contact info keys in display order; online profiles are labelled in the PDF, except the additional info
+PERSONAL_FIELDS = ('location', 'phone', 'email')
+ONLINE_FIELDS = (('linkedin', 'LinkedIn'), ('github', 'GitHub'), ('portfolio', 'Portfolio'), ('additional', None))
+CONTACT_FIELDS = PERSONAL_FIELDS + tuple(key for key, _ in ONLINE_FIELDS)
+
+# Entry sections of the resume JSON: list key, section title and kind, the item fields for the
+# title, subtitle and bullets, and whether the section is left out when empty
+ENTRY_SECTIONS = (
+    ("work_experience", "Work Experience", "experience", "title", "company", "achievements", False),
+    ("education", "Education", "education", "degree", "institution", "details", False),
+    ("projects", "Personal Projects", "projects", "name", None, "details", True),
+)
+
+def text_section(title, *blocks):
+    """Format a text resume section: bold title, then its blocks of lines, each followed by a blank line"""
+    return [f"**{title}:**", *(line for block in blocks for line in (*block, ""))]
+
+def text_entry(item, title_field, subtitle_field, bullets_field):
+    """Format an experience, education or project entry: header line, then its bullets"""
+    header = f"* {item.get(title_field, '')}"
+    if subtitle_field:
+        header += f", {item.get(subtitle_field, '')}"
+    if item.get('location'):
+        header += f" ({item.get('location', '')})"
+    if item.get('duration'):
+        header += f" - {item.get('duration', '')}"
+    return [header, *(f"  + {bullet}" for bullet in item.get(bullets_field, []))]
+
 def create_text_resume(resume_data):
     """Create a text version of the resume from JSON data"""
-    text_resume = []
-    
-    # Name
-    text_resume.append(f"**{resume_data.get('name', 'Name')}**")
-    text_resume.append("")
-    
-    # Contact Information
-    text_resume.append("**Contact Information:**")
     contact_info = resume_data.get('contact_info', {})
-    contact_parts = []
-    
-    if contact_info.get('location'):
-        contact_parts.append(contact_info['location'])
-    if contact_info.get('phone'):
-        contact_parts.append(contact_info['phone'])
-    if contact_info.get('email'):
-        contact_parts.append(contact_info['email'])
-    if contact_info.get('linkedin'):
-        contact_parts.append(contact_info['linkedin'])
-    if contact_info.get('github'):
-        contact_parts.append(contact_info['github'])
-    if contact_info.get('portfolio'):
-        contact_parts.append(contact_info['portfolio'])
-    if contact_info.get('additional'):
-        contact_parts.append(contact_info['additional'])
-    
-    text_resume.append(" | ".join(contact_parts))
-    text_resume.append("")
-    
-    # Professional Summary
-    text_resume.append("**Professional Summary:**")
-    text_resume.append(resume_data.get('professional_summary', ''))
-    text_resume.append("")
-    
-    # Skills
-    text_resume.append("**Skills:**")
-    for skill in resume_data.get('skills', []):
-        text_resume.append(f"* {skill}")
-    text_resume.append("")
-    
-    # Work Experience
-    text_resume.append("**Work Experience:**")
-    for job in resume_data.get('work_experience', []):
-        job_header = f"* {job.get('title', '')}, {job.get('company', '')}"
-        if job.get('location'):
-            job_header += f" ({job.get('location', '')})"
-        if job.get('duration'):
-            job_header += f" - {job.get('duration', '')}"
-        text_resume.append(job_header)
-        
-        for achievement in job.get('achievements', []):
-            text_resume.append(f"  + {achievement}")
-        text_resume.append("")
-    
-    # Education
-    text_resume.append("**Education:**")
-    for edu in resume_data.get('education', []):
-        edu_header = f"* {edu.get('degree', '')}, {edu.get('institution', '')}"
-        if edu.get('location'):
-            edu_header += f" ({edu.get('location', '')})"
-        if edu.get('duration'):
-            edu_header += f" - {edu.get('duration', '')}"
-        text_resume.append(edu_header)
-        
-        for detail in edu.get('details', []):
-            text_resume.append(f"  + {detail}")
-        text_resume.append("")
-    
-    # Projects
-    if resume_data.get('projects'):
-        text_resume.append("**Personal Projects:**")
-        for project in resume_data.get('projects', []):
-            text_resume.append(f"* {project.get('name', '')}")
-            
-            for detail in project.get('details', []):
-                text_resume.append(f"  + {detail}")
-            text_resume.append("")
+    text_resume = [
+        f"**{resume_data.get('name', 'Name')}**",
+        "",
+        *text_section("Contact Information", [" | ".join(value for key in CONTACT_FIELDS if (value := contact_info.get(key)))]),
+        *text_section("Professional Summary", [resume_data.get('professional_summary', '')]),
+        *text_section("Skills", [f"* {skill}" for skill in resume_data.get('skills', [])]),
+    ]
+    
+    # Work Experience, Education and Projects (if any)
+    for key, title, _, title_field, subtitle_field, bullets_field, optional in ENTRY_SECTIONS:
+        items = resume_data.get(key) or []
+        if optional and not items:
+            continue
+        text_resume.extend(text_section(title, *(text_entry(item, title_field, subtitle_field, bullets_field) for item in items)))
     
     return "\n".join(text_resume)
 
-def create_professional_pdf(resume_data, output_path):
-    """Create a professionally formatted PDF resume from JSON data"""
-    class PDF(FPDF):
-        def header(self):
-            # No header
-            pass
-        
-        def footer(self):
-            # Footer with page number
-            self.set_y(-15)
-            self.set_font('Arial', 'I', 8)
-            self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-    
-    pdf = PDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    
-    # Name at the top - centered and bold
-    pdf.set_font('Arial', 'B', 16)
-    pdf.cell(0, 10, resume_data.get('name', 'Name'), 0, 1, 'C')
-    pdf.ln(2)
-    
-    # Contact Information - formatted in a clean way
-    pdf.set_font('Arial', 'B', 12)
-    pdf.set_fill_color(240, 240, 240)  # Light gray background
-    pdf.cell(0, 8, "Contact Information", 1, 1, 'L', True)
-    pdf.ln(1)
-    
-    pdf.set_font('Arial', '', 10)
+def create_professional_pdf(resume_data):
+    """Create a professionally formatted PDF resume from JSON data and return it as bytes"""
+    sections = []
+    
+    # Contact Information - location, phone and email first, then online profiles
     contact_info = resume_data.get('contact_info', {})
-    contact_text = []
-    
-    if contact_info.get('location'):
-        contact_text.append(contact_info['location'])
-    if contact_info.get('phone'):
-        contact_text.append(contact_info['phone'])
-    if contact_info.get('email'):
-        contact_text.append(contact_info['email'])
-    
-    # First line of contact info
-    pdf.cell(0, 6, " | ".join(contact_text), 0, 1)
-    
-    online_links = []
-    if contact_info.get('linkedin'):
-        online_links.append(f"LinkedIn: {contact_info['linkedin']}")
-    if contact_info.get('github'):
-        online_links.append(f"GitHub: {contact_info['github']}")
-    if contact_info.get('portfolio'):
-        online_links.append(f"Portfolio: {contact_info['portfolio']}")
-    if contact_info.get('additional'):
-        online_links.append(contact_info['additional'])
+    contact_text = " | ".join(value for key in PERSONAL_FIELDS if (value := contact_info.get(key)))
     
     # Second line for online profiles
-    if online_links:
-        pdf.cell(0, 6, " | ".join(online_links), 0, 1)
-    
-    pdf.ln(5)
+    online_links = " | ".join(
+        f"{label}: {value}" if label else value
+        for key, label in ONLINE_FIELDS
+        if (value := contact_info.get(key))
+    )
+    sections.append(Section("Contact Information", "contact", [contact_text, online_links]))
     
     # Professional Summary
-    pdf.set_font('Arial', 'B', 12)
-    pdf.set_fill_color(240, 240, 240)
-    pdf.cell(0, 8, "Professional Summary", 1, 1, 'L', True)
-    pdf.ln(1)
-    
-    pdf.set_font('Arial', '', 10)
-    summary = resume_data.get('professional_summary', '')
-    wrapped_lines = textwrap.wrap(summary, width=100)
-    for line in wrapped_lines:
-        pdf.cell(0, 6, line, 0, 1)
-    
-    pdf.ln(5)
+    sections.append(Section("Professional Summary", "summary", [resume_data.get('professional_summary', '')]))
     
     # Skills
-    pdf.set_font('Arial', 'B', 12)
-    pdf.set_fill_color(240, 240, 240)
-    pdf.cell(0, 8, "Skills", 1, 1, 'L', True)
-    pdf.ln(1)
-    
-    pdf.set_font('Arial', '', 10)
-    skills = resume_data.get('skills', [])
-    
-    # Format skills as either bullet points or in categories
-    for skill in skills:
-        pdf.cell(5, 6, chr(149), 0, 0)  # Bullet point
-        pdf.cell(0, 6, skill, 0, 1)
-    
-    pdf.ln(5)
-    
-    # Work Experience
-    pdf.set_font('Arial', 'B', 12)
-    pdf.set_fill_color(240, 240, 240)
-    pdf.cell(0, 8, "Work Experience", 1, 1, 'L', True)
-    pdf.ln(1)
-    
-    for job in resume_data.get('work_experience', []):
-        # Job title
-        pdf.set_font('Arial', 'B', 10)
-        pdf.cell(0, 6, job.get('title', ''), 0, 1)
-        
-        # Company and duration
-        company_text = job.get('company', '')
-        if job.get('location'):
-            company_text += f", {job.get('location', '')}"
-        
-        pdf.set_font('Arial', 'I', 10)
-        pdf.cell(0, 6, company_text, 0, 1)
-        
-        if job.get('duration'):
-            pdf.cell(0, 6, job.get('duration', ''), 0, 1)
-        
-        # Achievements
-        pdf.set_font('Arial', '', 10)
-        for achievement in job.get('achievements', []):
-            pdf.cell(10, 6, '', 0, 0)  # Indentation
-            pdf.cell(3, 6, chr(149), 0, 0)  # Bullet point
-            
-            # Wrap text for bullet points
-            wrapped_lines = textwrap.wrap(achievement, width=85)
-            if wrapped_lines:
-                pdf.cell(0, 6, wrapped_lines[0], 0, 1)
-                for wrapped_line in wrapped_lines[1:]:
-                    pdf.cell(13, 6, '', 0, 0)  # Indentation
-                    pdf.cell(0, 6, wrapped_line, 0, 1)
-        
-        pdf.ln(3)  # Space between jobs
-    
-    pdf.ln(5)
-    
-    # Education
-    pdf.set_font('Arial', 'B', 12)
-    pdf.set_fill_color(240, 240, 240)
-    pdf.cell(0, 8, "Education", 1, 1, 'L', True)
-    pdf.ln(1)
+    sections.append(Section("Skills", "skills", resume_data.get('skills', [])))
     
-    for edu in resume_data.get('education', []):
-        # Degree
-        pdf.set_font('Arial', 'B', 10)
-        pdf.cell(0, 6, edu.get('degree', ''), 0, 1)
+    # Work Experience, Education and Projects (if any)
+    for key, title, kind, title_field, subtitle_field, bullets_field, optional in ENTRY_SECTIONS:
+        items = resume_data.get(key) or []
+        if optional and not items:
+            continue
         
-        # Institution and location
-        institution_text = edu.get('institution', '')
-        if edu.get('location'):
-            institution_text += f", {edu.get('location', '')}"
-        
-        pdf.set_font('Arial', 'I', 10)
-        pdf.cell(0, 6, institution_text, 0, 1)
-        
-        if edu.get('duration'):
-            pdf.cell(0, 6, edu.get('duration', ''), 0, 1)
-        
-        # Details
-        pdf.set_font('Arial', '', 10)
-        for detail in edu.get('details', []):
-            pdf.cell(10, 6, '', 0, 0)  # Indentation
-            pdf.cell(3, 6, chr(149), 0, 0)  # Bullet point
-            
-            # Wrap text for bullet points
-            wrapped_lines = textwrap.wrap(detail, width=85)
-            if wrapped_lines:
-                pdf.cell(0, 6, wrapped_lines[0], 0, 1)
-                for wrapped_line in wrapped_lines[1:]:
-                    pdf.cell(13, 6, '', 0, 0)  # Indentation
-                    pdf.cell(0, 6, wrapped_line, 0, 1)
-        
-        pdf.ln(3)  # Space between education items
-    
-    # Projects (if any)
-    if resume_data.get('projects'):
-        pdf.ln(5)
-        pdf.set_font('Arial', 'B', 12)
-        pdf.set_fill_color(240, 240, 240)
-        pdf.cell(0, 8, "Personal Projects", 1, 1, 'L', True)
-        pdf.ln(1)
-        
-        for project in resume_data.get('projects', []):
-            # Project name
-            pdf.set_font('Arial', 'B', 10)
-            pdf.cell(0, 6, project.get('name', ''), 0, 1)
-            
-            # Details
-            pdf.set_font('Arial', '', 10)
-            for detail in project.get('details', []):
-                pdf.cell(10, 6, '', 0, 0)  # Indentation
-                pdf.cell(3, 6, chr(149), 0, 0)  # Bullet point
-                
-                # Wrap text for bullet points
-                wrapped_lines = textwrap.wrap(detail, width=85)
-                if wrapped_lines:
-                    pdf.cell(0, 6, wrapped_lines[0], 0, 1)
-                    for wrapped_line in wrapped_lines[1:]:
-                        pdf.cell(13, 6, '', 0, 0)  # Indentation
-                        pdf.cell(0, 6, wrapped_line, 0, 1)
-            
-            pdf.ln(3)  # Space between projects
-    
-    # Save the PDF
-    pdf.output(output_path)
+        entries = []
+        for item in items:
+            # Subtitle line - e.g. company or institution, then location
+            subtitle_text = item.get(subtitle_field, '') if subtitle_field else ''
+            if item.get('location'):
+                subtitle_text += f", {item.get('location', '')}"
+            entries.append(Entry(item.get(title_field, ''), subtitle_text, item.get('duration', ''), item.get(bullets_field, [])))
+        sections.append(Section(title, kind, entries))
+    
+    return render_pdf(Resume(resume_data.get('name', 'Name'), sections))
+
+# Reruns with unchanged resume data reuse the rendered PDF; each edit adds an entry, so keep only the recent ones
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_pdf(resume_json):
+    """Create the PDF from the resume data serialized with sorted keys, so the cache key is one bytes hash"""
+    return create_professional_pdf(orjson.loads(resume_json))
+
+# Entry lists shown in the editor: list key, widget key prefix, single-line fields and the one-per-line bullets field
+EDITOR_ENTRIES = (
+    ("work_experience", "job", ("title", "company", "location", "duration"), "achievements"),
+    ("education", "edu", ("degree", "institution", "location", "duration"), "details"),
+    ("projects", "project", ("name",), "details"),
+)
+
+def split_lines(text):
+    """Split one-per-line widget text into its non-empty, stripped lines"""
+    return [line.strip() for line in text.split("\n") if line.strip()]
+
+def clear_pdf():
+    """Drop the generated PDF once the resume it was made from is edited"""
+    st.session_state.pdf_bytes = None
+
+def load_resume_into_state(resume_data):
+    """Fill the editor widgets' session state from resume data, replacing any earlier edits"""
+    for key in [key for key in st.session_state if key.startswith("editor_")]:
+        del st.session_state[key]
+    
+    contact_info = resume_data.get("contact_info") or {}
+    st.session_state.editor_name = resume_data.get("name") or ""
+    for field in CONTACT_FIELDS:
+        st.session_state[f"editor_{field}"] = contact_info.get(field) or ""
+    st.session_state.editor_summary = resume_data.get("professional_summary") or ""
+    st.session_state.editor_skills = "\n".join(resume_data.get("skills") or [])
+    
+    for list_key, prefix, fields, bullets_field in EDITOR_ENTRIES:
+        items = resume_data.get(list_key) or []
+        st.session_state[f"editor_{prefix}_count"] = len(items)
+        for i, item in enumerate(items):
+            for field in fields:
+                st.session_state[f"editor_{prefix}_{i}_{field}"] = item.get(field) or ""
+            st.session_state[f"editor_{prefix}_{i}_{bullets_field}"] = "\n".join(item.get(bullets_field) or [])
+    
+    st.session_state.pdf_bytes = None
+
+def keep_editor_state():
+    """Keep the editor's edits in session state across runs that do not draw the editor"""
+    # Streamlit drops a widget's state after a run without that widget; assigning the state makes it the app's own
+    for key in [key for key in st.session_state if key.startswith("editor_")]:
+        st.session_state[key] = st.session_state[key]
+
+def collect_resume_from_state(resume_data):
+    """Build the edited resume data from the editor widgets' session state, keeping any fields the editor does not show"""
+    state = st.session_state
+    resume_data = {
+        **resume_data,
+        "name": state.editor_name,
+        "contact_info": {field: state[f"editor_{field}"] for field in CONTACT_FIELDS},
+        "professional_summary": state.editor_summary,
+        "skills": split_lines(state.editor_skills),
+    }
+    
+    for list_key, prefix, fields, bullets_field in EDITOR_ENTRIES:
+        # Entries added in the editor have no state until their widgets are first shown
+        items = []
+        for i in range(state[f"editor_{prefix}_count"]):
+            item = {field: state.get(f"editor_{prefix}_{i}_{field}", "") for field in fields}
+            item[bullets_field] = split_lines(state.get(f"editor_{prefix}_{i}_{bullets_field}", ""))
+            items.append(item)
+        resume_data[list_key] = items
+    
+    return resume_data
 
 def main():
     st.set_page_config(page_title="AI Custom Resume by tinkvu",page_icon=":checkered_flag:", layout="wide")
@@ -429,56 +377,82 @@ def main():
         st.error("GROQ_API_KEY is not set in environment variables. Please set it and restart the application.")
         st.stop()
     
-    # Create two columns for inputs
-    col1, col2 = st.columns(2)
+    client = get_client(GROQ_API_KEY)
+    keep_editor_state()
+    # Fetched here, since the variants are generated on worker threads outside the script run
+    resume_cache = get_resume_cache(RESUME_CACHE)
     
-    with col1:
-        job_role = st.text_input("Job Role:", placeholder="Software Engineer")
-        
-        job_description = st.text_area(
-            "Job Description:", 
-            height=300,
-            placeholder="Paste the complete job description here..."
-        )
+    # These change which widgets are shown, so unlike the form inputs they apply right away
+    option = st.radio(
+        "Choose how you want to provide your Resume/CV:",
+        ("Upload File", "Paste Text")
+    )
     
-    with col2:
-        st.write("Upload or Paste Your Resume/CV")
-
-        option = st.radio(
-            "Choose how you want to provide your Resume/CV:",
-            ("Upload File", "Paste Text")
+    # The uploader sits outside the form so an upload reruns right away; the CV is extracted (and cached)
+    # while the job details are still being typed instead of after clicking Generate
+    original_cv = ""
+    if option == "Upload File":
+        uploaded_file = st.file_uploader(
+            "Upload your resume/CV (PDF, DOCX, TXT)", 
+            type=["pdf", "docx", "txt"]
         )
+        if uploaded_file is not None:
+            with st.spinner('Extracting text...'):
+                original_cv = extract_text_from_file(uploaded_file) or ""
+    
+    # Add option to edit the prompt
+    edit_prompt = st.checkbox("Edit AI Prompt", value=False, help="Enable to edit the prompt sent to the AI model")
     
+    # Inputs are sent together on submit, so typing in them does not rerun the app on every change
+    with st.form("resume_form"):
+        # Create two columns for inputs
         col1, col2 = st.columns(2)
-
+        
+        with col1:
+            job_role = st.text_input("Job Role:", placeholder="Software Engineer")
+            
+            job_description = st.text_area(
+                "Job Description:", 
+                height=300,
+                placeholder="Paste the complete job description here..."
+            )
+        
         with col2:
-            if option == "Upload File":
-                uploaded_file = st.file_uploader(
-                    "Upload your resume/CV (PDF, DOCX, TXT)", 
-                    type=["pdf", "docx", "doc", "txt"]
-                )
-                if uploaded_file is not None:
-                    with st.spinner('Extracting text...'):
-                        original_cv = extract_text_from_file(uploaded_file)
-                        if original_cv:
-                            st.success("Text extracted successfully!")
-                        else:
-                            original_cv = ""
-            else:
-                original_cv = st.text_area(
-                    "Paste your current Resume/CV:", 
-                    height=300,
-                    placeholder="Paste your current resume/CV content here..."
-                )
+            st.write("Upload or Paste Your Resume/CV")
+            
+            col1, col2 = st.columns(2)
+            
+            with col2:
+                if option == "Upload File":
+                    if original_cv:
+                        st.success("Text extracted successfully!")
+                    else:
+                        st.info("Upload your resume/CV above.")
+                else:
+                    original_cv = st.text_area(
+                        "Paste your current Resume/CV:", 
+                        height=300,
+                        placeholder="Paste your current resume/CV content here..."
+                    )
+            
+        # Add model selection
+        model = st.selectbox(
+            "Language Model:",
+            ["llama3-8b-8192", "llama3-70b-8192", "mixtral-8x7b-32768"]
+        )
         
-    # Add model selection
-    model = st.selectbox(
-        "Language Model:",
-        ["llama3-8b-8192", "llama3-70b-8192", "mixtral-8x7b-32768"]
-    )
+        # Groq returns a single choice per request, so variants are generated as concurrent requests
+        n_variants = st.slider("Number of variants:", min_value=1, max_value=3, value=1, help="Generate several versions of the resume to choose from")
+        
+        # When editing the prompt, submitting fills it in from the inputs and generating is a separate step
+        submitted = st.form_submit_button("Update AI Prompt" if edit_prompt else "Generate Customized Resume")
     
-    # Add option to edit the prompt
-    edit_prompt = st.checkbox("Edit AI Prompt", value=False, help="Enable to edit the prompt sent to the AI model")
+    # Keep the prompt within the context window instead of paying for a request that fails or loses the end of the CV
+    original_cv, job_description, cv_truncated, description_truncated = truncate_inputs(original_cv, job_role, job_description, model)
+    if cv_truncated:
+        st.warning(f"Your CV is too long and has been shortened to its first {len(original_cv):,} characters. Consider removing less relevant content.")
+    if description_truncated:
+        st.warning(f"The job description is too long and has been shortened to its first {len(job_description):,} characters. Consider keeping only the role's requirements.")
     
     # Initialize or retrieve custom_prompt from session state
     if 'custom_prompt' not in st.session_state:
@@ -487,21 +461,22 @@ def main():
     # If edit_prompt is checked, show the prompt editor
     custom_prompt = ""
     if edit_prompt:
-        # Generate the default prompt with current input values
-        default_prompt = get_default_prompt(job_role, job_description, original_cv)
-        
-        # If custom_prompt is empty or inputs have changed, update it
-        if not st.session_state.custom_prompt or st.session_state.get('prev_inputs') != (job_role, job_description):
-            st.session_state.custom_prompt = default_prompt
+        # If custom_prompt is empty or inputs have changed, update it from the default prompt with current input values
+        inputs = (job_role, job_description, original_cv)
+        if not st.session_state.custom_prompt or st.session_state.get('prev_inputs') != inputs:
+            st.session_state.custom_prompt = get_default_prompt(*inputs)
+            # Drop the editor's own state, so it shows the new default instead of keeping the old text
+            st.session_state.pop("prompt_editor", None)
         
         # Store current inputs for comparison on next render
-        st.session_state.prev_inputs = (job_role, job_description)
+        st.session_state.prev_inputs = inputs
         
         # Show the prompt editor
         custom_prompt = st.text_area(
             "Edit AI Prompt:",
             value=st.session_state.custom_prompt,
-            height=400
+            height=400,
+            key="prompt_editor"
         )
         
         # Update session state with edited prompt
@@ -510,7 +485,8 @@ def main():
         # Show reset button
         if st.button("Reset to Default Prompt"):
             st.session_state.custom_prompt = get_default_prompt(job_role, job_description, original_cv)
-            st.experimental_rerun()
+            del st.session_state["prompt_editor"]
+            st.rerun()
     
     # Create a session state to store the generated resume data
     if 'resume_data' not in st.session_state:
@@ -518,7 +494,8 @@ def main():
         st.session_state.generated = False
     
     # Process button
-    if st.button("Generate Customized Resume") or st.session_state.generated:
+    generate = st.button("Generate Customized Resume") if edit_prompt else submitted
+    if generate or st.session_state.generated:
         if not job_role or not job_description or not original_cv:
             st.error("Please fill in all fields")
         else:
@@ -528,21 +505,50 @@ def main():
                     # Determine which prompt to use
                     prompt_to_use = custom_prompt if edit_prompt and custom_prompt else get_default_prompt(job_role, job_description, original_cv)
                     
-                    # Get customized resume content as JSON
-                    result = get_customized_resume_json(prompt_to_use, model)
+                    if n_variants == 1:
+                        # Get customized resume content as JSON, streaming it into a preview as it arrives
+                        preview = st.empty()
+                        results = [get_customized_resume_json(client, resume_cache, prompt_to_use, model, preview)]
+                        preview.empty()
+                    else:
+                        # Get all variants at once; the client's connection pool serves the requests in parallel
+                        with ThreadPoolExecutor(max_workers=n_variants) as executor:
+                            results = list(executor.map(
+                                lambda variant: get_customized_resume_json(client, resume_cache, prompt_to_use, model, variant=variant),
+                                range(n_variants)
+                            ))
                     
-                    if not result["success"]:
+                    variants = [result["data"] for result in results if result["success"]]
+                    if not variants:
+                        result = results[0]
                         st.error(f"Error: {result.get('error', 'Unknown error')}")
                         st.text_area("Raw API response:", value=result.get('raw', ''), height=200)
                         st.stop()
                     else:
-                        st.session_state.resume_data = result["data"]
+                        if len(variants) < len(results):
+                            st.warning(f"{len(results) - len(variants)} of the {len(results)} variants could not be generated.")
+                        if any(result.get("repaired") for result in results):
+                            st.warning("The AI response was incomplete and has been repaired. Please review the resume for missing details.")
+                        st.session_state.resume_variants = variants
+                        st.session_state.resume_data = variants[0]
+                        load_resume_into_state(variants[0])
                         st.session_state.generated = True
             
-            # Now handle the editing and display
-            resume_data = st.session_state.resume_data
+            # Let the user pick which variant to edit
+            variants = st.session_state.get("resume_variants", [])
+            if len(variants) > 1:
+                st.subheader("Resume Variants:")
+                variant_tabs = st.tabs([f"Variant {i+1}" for i in range(len(variants))])
+                for i, (variant_tab, variant) in enumerate(zip(variant_tabs, variants)):
+                    with variant_tab:
+                        st.markdown(create_text_resume(variant))
+                        if st.button("Edit this variant", key=f"edit_variant_{i}"):
+                            st.session_state.resume_data = variant
+                            load_resume_into_state(variant)
             
-            # Create editing interface with tabs
+            # Now handle the editing and display
+            # The widgets keep their values in session state, so a keystroke only updates that widget's state;
+            # the resume data is rebuilt from it once, when the PDF is generated
             st.subheader("Edit Your Resume:")
             tabs = st.tabs(["Personal Info", "Summary", "Skills", "Work Experience", "Education", "Projects"])
             
@@ -550,151 +556,104 @@ def main():
             with tabs[0]:
                 col1, col2 = st.columns(2)
                 with col1:
-                    resume_data["name"] = st.text_input("Name:", value=resume_data.get("name", ""))
-                    resume_data["contact_info"]["location"] = st.text_input("Location:", value=resume_data.get("contact_info", {}).get("location", ""))
-                    resume_data["contact_info"]["phone"] = st.text_input("Phone:", value=resume_data.get("contact_info", {}).get("phone", ""))
-                    resume_data["contact_info"]["email"] = st.text_input("Email:", value=resume_data.get("contact_info", {}).get("email", ""))
+                    st.text_input("Name:", key="editor_name", on_change=clear_pdf)
+                    st.text_input("Location:", key="editor_location", on_change=clear_pdf)
+                    st.text_input("Phone:", key="editor_phone", on_change=clear_pdf)
+                    st.text_input("Email:", key="editor_email", on_change=clear_pdf)
                 
                 with col2:
-                    resume_data["contact_info"]["linkedin"] = st.text_input("LinkedIn URL:", value=resume_data.get("contact_info", {}).get("linkedin", ""))
-                    resume_data["contact_info"]["github"] = st.text_input("GitHub URL:", value=resume_data.get("contact_info", {}).get("github", ""))
-                    resume_data["contact_info"]["portfolio"] = st.text_input("Portfolio URL:", value=resume_data.get("contact_info", {}).get("portfolio", ""))
-                    resume_data["contact_info"]["additional"] = st.text_input("Additional Contact Info:", value=resume_data.get("contact_info", {}).get("additional", ""))
+                    st.text_input("LinkedIn URL:", key="editor_linkedin", on_change=clear_pdf)
+                    st.text_input("GitHub URL:", key="editor_github", on_change=clear_pdf)
+                    st.text_input("Portfolio URL:", key="editor_portfolio", on_change=clear_pdf)
+                    st.text_input("Additional Contact Info:", key="editor_additional", on_change=clear_pdf)
             
             # Summary Tab
             with tabs[1]:
-                resume_data["professional_summary"] = st.text_area("Professional Summary:", value=resume_data.get("professional_summary", ""), height=200)
+                st.text_area("Professional Summary:", key="editor_summary", height=200, on_change=clear_pdf)
             
             # Skills Tab
             with tabs[2]:
-                skills = resume_data.get("skills", [])
-                skills_text = "\n".join(skills)
-                skills_text = st.text_area("Skills (One per line):", value=skills_text, height=200)
-                resume_data["skills"] = [s.strip() for s in skills_text.split("\n") if s.strip()]
+                st.text_area("Skills (One per line):", key="editor_skills", height=200, on_change=clear_pdf)
             
             # Work Experience Tab
             with tabs[3]:
-                work_experiences = resume_data.get("work_experience", [])
-                work_experiences_count = len(work_experiences)
-                
-                work_experiences_count = st.number_input("Number of work experiences:", min_value=0, value=work_experiences_count)
+                work_experiences_count = st.number_input("Number of work experiences:", min_value=0, key="editor_job_count", on_change=clear_pdf)
                 
-                new_work_experiences = []
                 for i in range(work_experiences_count):
                     st.subheader(f"Work Experience #{i+1}")
                     
-                    job = {} if i >= len(work_experiences) else work_experiences[i]
-                    
                     col1, col2 = st.columns(2)
                     with col1:
-                        job["title"] = st.text_input(f"Job Title #{i+1}:", value=job.get("title", ""))
-                        job["company"] = st.text_input(f"Company #{i+1}:", value=job.get("company", ""))
+                        st.text_input(f"Job Title #{i+1}:", key=f"editor_job_{i}_title", on_change=clear_pdf)
+                        st.text_input(f"Company #{i+1}:", key=f"editor_job_{i}_company", on_change=clear_pdf)
                     
                     with col2:
-                        job["location"] = st.text_input(f"Location #{i+1}:", value=job.get("location", ""))
-                        job["duration"] = st.text_input(f"Duration #{i+1}:", value=job.get("duration", ""))
-                    
-                    achievements = job.get("achievements", [])
-                    achievements_text = "\n".join(achievements)
-                    achievements_text = st.text_area(f"Achievements #{i+1} (One per line):", value=achievements_text)
-                    job["achievements"] = [a.strip() for a in achievements_text.split("\n") if a.strip()]
+                        st.text_input(f"Location #{i+1}:", key=f"editor_job_{i}_location", on_change=clear_pdf)
+                        st.text_input(f"Duration #{i+1}:", key=f"editor_job_{i}_duration", on_change=clear_pdf)
                     
-                    new_work_experiences.append(job)
+                    st.text_area(f"Achievements #{i+1} (One per line):", key=f"editor_job_{i}_achievements", on_change=clear_pdf)
                     st.markdown("---")
-                
-                resume_data["work_experience"] = new_work_experiences
             
             # Education Tab
             with tabs[4]:
-                educations = resume_data.get("education", [])
-                educations_count = len(educations)
-                
-                educations_count = st.number_input("Number of education entries:", min_value=0, value=educations_count)
+                educations_count = st.number_input("Number of education entries:", min_value=0, key="editor_edu_count", on_change=clear_pdf)
                 
-                new_educations = []
                 for i in range(educations_count):
                     st.subheader(f"Education #{i+1}")
                     
-                    edu = {} if i >= len(educations) else educations[i]
-                    
                     col1, col2 = st.columns(2)
                     with col1:
-                        edu["degree"] = st.text_input(f"Degree #{i+1}:", value=edu.get("degree", ""))
-                        edu["institution"] = st.text_input(f"Institution #{i+1}:", value=edu.get("institution", ""))
+                        st.text_input(f"Degree #{i+1}:", key=f"editor_edu_{i}_degree", on_change=clear_pdf)
+                        st.text_input(f"Institution #{i+1}:", key=f"editor_edu_{i}_institution", on_change=clear_pdf)
                     
                     with col2:
-                        edu["location"] = st.text_input(f"Education Location #{i+1}:", value=edu.get("location", ""))
-                        edu["duration"] = st.text_input(f"Education Duration #{i+1}:", value=edu.get("duration", ""))
-                    
-                    details = edu.get("details", [])
-                    details_text = "\n".join(details)
-                    details_text = st.text_area(f"Details #{i+1} (One per line):", value=details_text)
-                    edu["details"] = [d.strip() for d in details_text.split("\n") if d.strip()]
+                        st.text_input(f"Education Location #{i+1}:", key=f"editor_edu_{i}_location", on_change=clear_pdf)
+                        st.text_input(f"Education Duration #{i+1}:", key=f"editor_edu_{i}_duration", on_change=clear_pdf)
                     
-                    new_educations.append(edu)
+                    st.text_area(f"Details #{i+1} (One per line):", key=f"editor_edu_{i}_details", on_change=clear_pdf)
                     st.markdown("---")
-                
-                resume_data["education"] = new_educations
             
             # Projects Tab
             with tabs[5]:
-                projects = resume_data.get("projects", [])
-                if not projects:
-                    projects = []
-                
-                projects_count = len(projects)
-                projects_count = st.number_input("Number of projects:", min_value=0, value=projects_count)
+                projects_count = st.number_input("Number of projects:", min_value=0, key="editor_project_count", on_change=clear_pdf)
                 
-                new_projects = []
                 for i in range(projects_count):
                     st.subheader(f"Project #{i+1}")
                     
-                    project = {} if i >= len(projects) else projects[i]
-                    
-                    project["name"] = st.text_input(f"Project Name #{i+1}:", value=project.get("name", ""))
-                    
-                    details = project.get("details", [])
-                    details_text = "\n".join(details)
-                    details_text = st.text_area(f"Project Details #{i+1} (One per line):", value=details_text)
-                    project["details"] = [d.strip() for d in details_text.split("\n") if d.strip()]
-                    
-                    new_projects.append(project)
+                    st.text_input(f"Project Name #{i+1}:", key=f"editor_project_{i}_name", on_change=clear_pdf)
+                    st.text_area(f"Project Details #{i+1} (One per line):", key=f"editor_project_{i}_details", on_change=clear_pdf)
                     st.markdown("---")
-                
-                resume_data["projects"] = new_projects
             
-            # Preview and download section
+            # Create PDF button
+            if st.button("Generate Final PDF"):
+                # Collect the edits and create the PDF from them, kept in the session so later reruns (e.g. the download click) reuse it
+                st.session_state.resume_data = collect_resume_from_state(st.session_state.resume_data)
+                # Sorted keys, so resume data that differs only in key order shares the cached PDF
+                st.session_state.pdf_bytes = build_pdf(orjson.dumps(st.session_state.resume_data, option=orjson.OPT_SORT_KEYS))
+            
+            # Preview section
             st.subheader("Resume Preview")
-            text_resume = create_text_resume(resume_data)
+            # Built from the current edits, without replacing the resume data the editor was loaded from
+            text_resume = create_text_resume(collect_resume_from_state(st.session_state.resume_data))
             st.text_area("Text Preview:", value=text_resume, height=300)
             
-            # Create PDF button
-            if st.button("Generate Final PDF"):
-                # Create temporary file for PDF
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    tmp_path = tmp_file.name
-                
-                # Create PDF from edited JSON data
-                create_professional_pdf(resume_data, tmp_path)
-                
-                # Provide download button for PDF
-                with open(tmp_path, "rb") as pdf_file:
-                    st.download_button(
-                        label="Download Resume as PDF",
-                        data=pdf_file,
-                        file_name=f"{job_role.replace(' ', '_')}.pdf",
-                        mime="application/pdf"
-                    )
-                
-                # Clean up the temporary file
-                os.unlink(tmp_path)
+            # Provide download button for PDF; any edit clears it until the PDF is generated again
+            if st.session_state.get("pdf_bytes"):
+                st.download_button(
+                    label="Download Resume as PDF",
+                    data=st.session_state.pdf_bytes,
+                    file_name=f"{job_role.replace(' ', '_')}.pdf",
+                    mime="application/pdf"
+                )
             
             # Add button to reset and start over
             if st.button("Start Over"):
                 st.session_state.resume_data = None
+                st.session_state.resume_variants = []
+                st.session_state.pdf_bytes = None
                 st.session_state.generated = False
                 st.session_state.custom_prompt = ""
-                st.experimental_rerun()
+                st.rerun()
 
 if __name__ == "__main__":
     main()
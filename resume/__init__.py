@@ -0,0 +1,8 @@
+from .cache import get_resume_cache
+from .client import get_client, stream_tokens
+from .extract import extract_pdf_text
+from .model import Entry, Resume, Section
+from .parse import parse_resume
+from .pdf import render_pdf
+
+__all__ = ["Entry", "Resume", "Section", "extract_pdf_text", "get_client", "get_resume_cache", "parse_resume", "render_pdf", "stream_tokens"]
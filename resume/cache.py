@@ -0,0 +1,15 @@
+import atexit
+import shutil
+import tempfile
+
+import diskcache
+import streamlit as st
+
+@st.cache_resource
+def get_resume_cache(name):
+    """Get the cache of generated resumes for an app, opened once and shared across reruns and sessions,
+    so repeated requests skip the API call"""
+    # It holds CVs and generated resumes, so it lives in a directory only this user can read, removed on exit
+    directory = tempfile.mkdtemp(prefix=f"{name}-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return diskcache.Cache(directory, size_limit=64 * 1024 * 1024)
@@ -0,0 +1,29 @@
+import groq
+import httpx
+import streamlit as st
+
+# Characters of the streamed response shown in the live preview
+PREVIEW_CHARS = 2000
+
+@st.cache_resource
+def get_client(api_key):
+    """Get the Groq client for an API key, created on first use and reused across reruns.
+    The HTTP/2 connection pool keeps connections to the API warm between requests."""
+    return groq.Groq(
+        api_key=api_key,
+        http_client=httpx.Client(http2=True, limits=httpx.Limits(max_keepalive_connections=20)),
+    )
+
+def stream_tokens(response, preview):
+    """Collect a streamed chat completion into its content, showing it in the preview placeholder as tokens arrive"""
+    tokens = []
+    for chunk in response:
+        token = chunk.choices[0].delta.content
+        if not token:
+            continue
+        
+        tokens.append(token)
+        # Only the tail is sent, so each update stays small however long the response gets
+        preview.code("".join(tokens)[-PREVIEW_CHARS:], language="json")
+    
+    return "".join(tokens)
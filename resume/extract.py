@@ -0,0 +1,41 @@
+import multiprocessing
+
+import pymupdf
+
+def read_pdf_text(pdf_bytes, max_pages):
+    """Extract the text of the first max_pages pages of a PDF"""
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return "\n".join(page.get_text("text") for page in doc.pages(0, min(max_pages, doc.page_count)))
+
+def send_pdf_text(connection, pdf_bytes, max_pages):
+    """Extract the text of a PDF in the child process and send it, or the error raised, to the parent"""
+    try:
+        connection.send(read_pdf_text(pdf_bytes, max_pages))
+    except Exception as e:
+        connection.send(e)
+
+def extract_pdf_text(pdf_bytes, max_pages, timeout):
+    """Extract the text of the first max_pages pages of a PDF in a child process, killed after timeout seconds.
+    PyMuPDF is not thread-safe and holds the GIL while extracting, so a thread could neither run it alongside
+    other sessions nor be stopped on a stuck page; raises TimeoutError when the child is killed."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=send_pdf_text, args=(sender, pdf_bytes, max_pages), daemon=True)
+    process.start()
+    sender.close()
+    
+    try:
+        if not receiver.poll(timeout):
+            raise TimeoutError(f"PDF text extraction took longer than {timeout} seconds")
+        try:
+            result = receiver.recv()
+        except EOFError:
+            raise RuntimeError("PDF text extraction stopped unexpectedly") from None
+    finally:
+        # A stuck child is killed, so it cannot hold on to a CPU after the timeout
+        process.kill()
+        process.join()
+        receiver.close()
+    
+    if isinstance(result, Exception):
+        raise result
+    return result
@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+
+# Section kinds whose items are Entry objects rather than plain strings
+ENTRY_KINDS = ("experience", "education", "projects")
+
+@dataclass(slots=True)
+class Entry:
+    """An experience, education or project entry"""
+    title: str
+    subtitle: str = ""
+    duration: str = ""
+    bullets: list[str] = field(default_factory=list)
+
+@dataclass(slots=True)
+class Section:
+    """A titled resume section; kind selects how its items are laid out"""
+    title: str
+    kind: str
+    items: list = field(default_factory=list)
+
+@dataclass(slots=True)
+class Resume:
+    """A parsed resume, ready to be rendered"""
+    name: str
+    sections: list[Section] = field(default_factory=list)
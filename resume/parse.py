@@ -0,0 +1,62 @@
+import json
+
+import json_repair
+
+from .model import ENTRY_KINDS, Entry, Resume, Section
+
+def parse_text(value):
+    """Get a text field as a string; numbers are kept, other JSON values (null, objects, lists) are dropped"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return ""
+
+def parse_lines(items):
+    """Get a list of text items, dropping the ones that are not text; anything but a list has no items"""
+    if not isinstance(items, list):
+        return []
+    return [line for line in map(parse_text, items) if line]
+
+def parse_entry(item):
+    """Parse one experience, education or project item"""
+    if isinstance(item, str):
+        return Entry(title=item)
+    return Entry(
+        title=parse_text(item.get("title")),
+        subtitle=parse_text(item.get("subtitle")),
+        duration=parse_text(item.get("duration")),
+        bullets=parse_lines(item.get("bullets")),
+    )
+
+def parse_resume(content):
+    """Parse the model's JSON resume; unparseable content (e.g. API errors) gives a resume with no sections"""
+    # Tolerate code fences or stray text around the object
+    start, end = content.find('{'), content.rfind('}')
+    try:
+        resume_data = json.loads(content[start:end + 1])
+    except json.JSONDecodeError:
+        # The response was likely cut off at max_tokens; close the open strings and brackets to salvage it
+        resume_data = json_repair.loads(content[start:]) if start != -1 else None
+    
+    if not isinstance(resume_data, dict):
+        return Resume(name=content.split('\n', 1)[0])
+    
+    # Valid JSON can still stray from the schema, so anything of the wrong type is skipped rather than rendered
+    sections = []
+    section_data = resume_data.get("sections")
+    for section in section_data if isinstance(section_data, list) else []:
+        if not isinstance(section, dict):
+            continue
+        kind = parse_text(section.get("kind")) or "other"
+        if kind in ENTRY_KINDS:
+            items = section.get("items")
+            items = [parse_entry(item) for item in items if isinstance(item, (str, dict))] if isinstance(items, list) else []
+        elif kind == "contact":
+            # Keep the contact details on a single line
+            items = [' | '.join(parse_lines(section.get("items")))]
+        else:
+            items = parse_lines(section.get("items"))
+        sections.append(Section(title=parse_text(section.get("title")), kind=kind, items=items))
+    
+    return Resume(name=parse_text(resume_data.get("name")) or "Name", sections=sections)
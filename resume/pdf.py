@@ -0,0 +1,109 @@
+from fpdf import FPDF
+
+from .model import ENTRY_KINDS
+
+# PDF styles, defined once and shared by every rendered resume.
+# Helvetica is the core font fpdf2 substitutes for Arial; naming it directly skips the
+# alias lookup and deprecation warning fpdf2 raises on every set_font('Arial') call.
+NAME_FONT = ('Helvetica', 'B', 16)
+SECTION_FONT = ('Helvetica', 'B', 12)
+SECTION_FILL = (240, 240, 240)  # Light gray background
+TITLE_FONT = ('Helvetica', 'B', 10)
+SUBTITLE_FONT = ('Helvetica', 'I', 10)
+BODY_FONT = ('Helvetica', '', 10)
+FOOTER_FONT = ('Helvetica', 'I', 8)
+
+# Common symbols outside WinAnsiEncoding, spelled with ones it has instead of being replaced with '?'
+TEXT_REPLACEMENTS = str.maketrans({'→': '->', '←': '<-', '≥': '>=', '≤': '<=', '≈': '~', '−': '-', '✓': '•', '✔': '•'})
+
+class PDF(FPDF):
+    def __init__(self):
+        # Base document state shared by every resume
+        super().__init__()
+        self.set_auto_page_break(auto=True, margin=15)
+        # Core fonts use WinAnsiEncoding, so dashes, curly quotes and bullets render without a TTF font
+        self.core_fonts_encoding = "windows-1252"
+    
+    def normalize_text(self, text):
+        # Characters the core fonts cannot encode (e.g. emoji, CJK) become '?' instead of failing the whole PDF
+        if self.is_ttf_font:
+            return super().normalize_text(text)
+        return text.translate(TEXT_REPLACEMENTS).encode(self.core_fonts_encoding, "replace").decode("latin-1")
+    
+    def header(self):
+        # No header
+        pass
+    
+    def footer(self):
+        # Footer with page number
+        self.set_y(-15)
+        self.set_font(*FOOTER_FONT)
+        self.cell(0, 10, f'Page {self.page_no()}', align='C')
+
+def add_entry(pdf, entry):
+    """Render an experience, education or project entry: bold title, italic subtitle and duration, bullets"""
+    pdf.set_font(*TITLE_FONT)
+    pdf.cell(0, 6, entry.title, new_x="LMARGIN", new_y="NEXT")
+    
+    pdf.set_font(*SUBTITLE_FONT)
+    if entry.subtitle:
+        pdf.cell(0, 6, entry.subtitle, new_x="LMARGIN", new_y="NEXT")
+    if entry.duration:
+        pdf.cell(0, 6, entry.duration, new_x="LMARGIN", new_y="NEXT")
+    
+    pdf.set_font(*BODY_FONT)
+    for bullet_text in entry.bullets:
+        pdf.cell(10, 6, '')  # Indentation
+        pdf.cell(3, 6, '•')  # Bullet point
+        
+        # multi_cell wraps continuation lines at the bullet text's x
+        pdf.multi_cell(0, 6, bullet_text, align="L", new_x="LMARGIN", new_y="NEXT")
+    
+    pdf.ln(3)  # Space between entries
+
+def add_section_header(pdf, title):
+    """Render a section title as a bordered, filled bar"""
+    pdf.set_font(*SECTION_FONT)
+    pdf.set_fill_color(*SECTION_FILL)
+    pdf.cell(0, 8, title, border=1, align='L', fill=True, new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(1)
+
+def add_section(pdf, section):
+    """Render one resume section (header and its items) into the PDF"""
+    add_section_header(pdf, section.title)
+    
+    # Special formatting for different kinds of sections; entries set their own fonts
+    if section.kind == "skills":
+        # Format skills as bullet points
+        pdf.set_font(*BODY_FONT)
+        for skill in section.items:
+            pdf.cell(5, 6, '•')  # Bullet point
+            pdf.cell(0, 6, skill, new_x="LMARGIN", new_y="NEXT")
+    
+    elif section.kind in ENTRY_KINDS:
+        for entry in section.items:
+            add_entry(pdf, entry)
+    
+    else:
+        # Default formatting for contact, summary and other sections: one wrapped paragraph per item
+        pdf.set_font(*BODY_FONT)
+        for line in section.items:
+            if line:
+                pdf.multi_cell(0, 6, line, align="L", new_x="LMARGIN", new_y="NEXT")
+    
+    pdf.ln(5)  # Add space between sections
+
+def render_pdf(resume):
+    """Create a professionally formatted PDF from a Resume and return it as bytes"""
+    pdf = PDF()
+    pdf.add_page()
+    
+    # Name at the top - centered and bold
+    pdf.set_font(*NAME_FONT)
+    pdf.cell(0, 10, resume.name, align='C', new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(2)
+    
+    for section in resume.sections:
+        add_section(pdf, section)
+    
+    return bytes(pdf.output())